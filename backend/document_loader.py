@@ -2,15 +2,16 @@ import os
 import json
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 import logging
 from dataclasses import dataclass, asdict
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from llm_wrapper import LLMWrapper
-from soap_parser import SOAPParser, SOAPContent, SOAPChunk, SOAPSection
+from soap_parser import SOAPContent, SOAPChunk, SOAPSection, get_default_parser
 import PyPDF2
 from docx import Document as DocxDocument
 
@@ -45,14 +46,16 @@ class DocumentChunk:
 class DocumentLoader:
     """Handles loading and processing of meeting notes for specific clients"""
     
-    def __init__(self, data_dir: str = "data", llm_wrapper: Optional[LLMWrapper] = None, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(self, data_dir: str = "data", llm_wrapper: Optional[LLMWrapper] = None, chunk_size: int = 1000, chunk_overlap: int = 200, max_workers: int = 4):
         self.data_dir = Path(data_dir)
         self.llm_wrapper = llm_wrapper or LLMWrapper()
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        # Files are parsed and summarized concurrently; the work is dominated by LLM round-trips
+        self.max_workers = max_workers
         
         # Initialize SOAP parser
-        self.soap_parser = SOAPParser()
+        self.soap_parser = get_default_parser()
         
         # Initialize text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -142,6 +145,13 @@ class DocumentLoader:
             logger.error(f"Error extracting info from filename {filename}: {e}")
             return None
     
+    def _date_to_ordinal(self, date_str: str) -> int:
+        """Convert a YYYY-MM-DD date to a proleptic ordinal for range filtering (0 if unparseable)"""
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+        except (TypeError, ValueError):
+            return 0
+    
     def _extract_text_from_pdf(self, file_path: Path) -> str:
         """Extract text content from PDF file"""
         try:
@@ -246,6 +256,7 @@ class DocumentLoader:
         base_metadata = {
             'source_file': meeting_note.file_path,
             'date': meeting_note.date,
+            'date_ordinal': self._date_to_ordinal(meeting_note.date),
             'title': meeting_note.title,
             'client_id': meeting_note.client_id,
             'meeting_id': meeting_note.meeting_id,
@@ -290,6 +301,7 @@ class DocumentLoader:
                 metadata={
                     'source_file': meeting_note.file_path,
                     'date': meeting_note.date,
+                    'date_ordinal': self._date_to_ordinal(meeting_note.date),
                     'title': meeting_note.title,
                     'total_chunks': len(chunks),
                     'client_id': meeting_note.client_id,
@@ -303,6 +315,27 @@ class DocumentLoader:
         
         return document_chunks
     
+    @staticmethod
+    def _flatten_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Join list values into comma-separated strings, since vector stores only keep scalars"""
+        return {
+            key: ", ".join(str(v) for v in value) if isinstance(value, list) else value
+            for key, value in metadata.items()
+        }
+    
+    def _process_single_file(self, file_path: Path, client_id: str) -> Optional[Tuple[MeetingNote, List[DocumentChunk]]]:
+        """Load, chunk and LLM-enrich a single file (safe to run from worker threads)"""
+        meeting_note = self.load_single_document(file_path, client_id=client_id)
+        if not meeting_note:
+            return None
+        
+        raw_chunks = self.chunk_document(meeting_note)
+        for chunk in raw_chunks:
+            enriched = self.llm_wrapper.summarize_chunk(chunk.content)
+            chunk.metadata.update(self._flatten_metadata(enriched))
+        
+        return meeting_note, raw_chunks
+    
     def process_client_documents(self, client_id: str, force_reprocess: bool = False) -> List[DocumentChunk]:
         """Process all documents for a specific client"""
         client_dir = self.data_dir / "clients" / client_id
@@ -313,6 +346,7 @@ class DocumentLoader:
         
         all_chunks = []
         processed_files = []
+        pending_files = []
         
         # Find all supported files for the client (txt, pdf, and docx)
         supported_files = (list(client_dir.glob("*.txt")) + 
@@ -320,39 +354,57 @@ class DocumentLoader:
                           list(client_dir.glob("*.docx")))
         for file_path in supported_files:
             try:
-                file_hash = self._generate_file_hash(file_path)
                 cache_key = f"{client_id}_{file_path.name}"
+                stat = file_path.stat()
+                file_stat = [stat.st_mtime_ns, stat.st_size]
+                cached = None if force_reprocess else self.metadata_cache.get(cache_key)
+                
+                # Same mtime and size as last time: unchanged, no need to hash the file
+                if cached and cached.get('file_stat') == file_stat:
+                    logger.info(f"Skipping {file_path.name} - already processed and unchanged")
+                    continue
                 
                 # Check if file has been processed and hasn't changed
-                if not force_reprocess and cache_key in self.metadata_cache:
-                    cached_hash = self.metadata_cache[cache_key].get('file_hash', '')
-                    if cached_hash == file_hash:
-                        logger.info(f"Skipping {file_path.name} - already processed and unchanged")
-                        continue
+                file_hash = self._generate_file_hash(file_path)
+                if cached and cached.get('file_hash', '') == file_hash:
+                    cached['file_stat'] = file_stat
+                    logger.info(f"Skipping {file_path.name} - already processed and unchanged")
+                    continue
                 
-                # Load and process the document
-                meeting_note = self.load_single_document(file_path, client_id=client_id)
-                if meeting_note:
-                    raw_chunks = self.chunk_document(meeting_note)
-                    for chunk in raw_chunks:
-                        enriched = self.llm_wrapper.summarize_chunk(chunk.content)
-                        chunk.metadata.update(enriched)
-                    all_chunks.extend(raw_chunks)
-                    
-                    # Update cache
-                    self.metadata_cache[cache_key] = {
-                        'file_hash': file_hash,
-                        'processed_at': datetime.now().isoformat(),
-                        'chunk_count': len(raw_chunks),
-                        'meeting_id': meeting_note.meeting_id
-                    }
-                    
-                    processed_files.append(file_path.name)
-                    logger.info(f"Processed {file_path.name}: {len(raw_chunks)} chunks")
+                pending_files.append((file_path, file_hash, file_stat, cache_key))
                 
             except Exception as e:
                 logger.error(f"Error processing {file_path}: {e}")
         
+        # Load, chunk and summarize changed files concurrently, collecting results in file order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                (file_path, file_hash, file_stat, cache_key, executor.submit(self._process_single_file, file_path, client_id))
+                for file_path, file_hash, file_stat, cache_key in pending_files
+            ]
+            
+            for file_path, file_hash, file_stat, cache_key, future in futures:
+                try:
+                    result = future.result()
+                    if result:
+                        meeting_note, raw_chunks = result
+                        all_chunks.extend(raw_chunks)
+                        
+                        # Update cache
+                        self.metadata_cache[cache_key] = {
+                            'file_hash': file_hash,
+                            'file_stat': file_stat,
+                            'processed_at': datetime.now().isoformat(),
+                            'chunk_count': len(raw_chunks),
+                            'meeting_id': meeting_note.meeting_id
+                        }
+                        
+                        processed_files.append(file_path.name)
+                        logger.info(f"Processed {file_path.name}: {len(raw_chunks)} chunks")
+                
+                except Exception as e:
+                    logger.error(f"Error processing {file_path}: {e}")
+        
         # Save updated cache
         self._save_metadata_cache()
         
@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import json
 from typing import Dict
@@ -12,6 +13,11 @@ class LLMWrapper:
     def __init__(self, model_name: str = "mistral", endpoint: str = "http://localhost:11434/api/generate"):
         self.model_name = model_name
         self.endpoint = endpoint
+        # Keep-alive connections to the LLM server, shared by concurrent ingestion workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def log_failed_chunk(self, chunk_text: str, error_type: str):
         """Log failed chunk and error type to a file for future review."""
@@ -42,7 +48,7 @@ Respond ONLY with a valid JSON object, for example:
 }}
 """
         try:
-            response = requests.post(self.endpoint, json={
+            response = self.session.post(self.endpoint, json={
                 "model": self.model_name,
                 "prompt": prompt,
                 "stream": False
@@ -56,7 +62,7 @@ Respond ONLY with a valid JSON object, for example:
                 self.log_failed_chunk(chunk_text, "json_decode_error_first_attempt")
                 retry_prompt = prompt + "\n\nPlease reformat the output as valid JSON."
                 try:
-                    retry_response = requests.post(self.endpoint, json={
+                    retry_response = self.session.post(self.endpoint, json={
                         "model": self.model_name,
                         "prompt": retry_prompt,
                         "stream": False
@@ -85,7 +91,7 @@ Respond ONLY with a valid JSON object, for example:
     def generate_text(self, prompt: str) -> str:
         """Stream a full response to a counselor query using retrieved context."""
         try:
-            response = requests.post(self.endpoint, json={
+            response = self.session.post(self.endpoint, json={
                 "model": self.model_name,
                 "prompt": prompt,
                 "stream": True
@@ -110,7 +116,7 @@ Respond ONLY with a valid JSON object, for example:
     def generate_text_stream(self, prompt: str):
         """Generator that yields streaming tokens for web responses."""
         try:
-            response = requests.post(self.endpoint, json={
+            response = self.session.post(self.endpoint, json={
                 "model": self.model_name,
                 "prompt": prompt,
                 "stream": True
@@ -166,6 +166,7 @@ def query_docs_stream(req: QueryRequest):
                 return
 
             # Step 2: Construct context and prompt
+            relevant_chunks = engine.select_context_chunks(relevant_chunks)
             context = "\n\n".join(chunk['content'] for chunk in relevant_chunks)
             sources = [
                 {
@@ -177,17 +178,13 @@ def query_docs_stream(req: QueryRequest):
             ]
 
             # Calculate confidence
-            import numpy as np
-            avg_similarity = np.mean([
-                max(0.0, min(1.0, 1 - chunk.get('distance', 1)))
-                for chunk in relevant_chunks
-            ])
+            avg_similarity = engine.compute_confidence(relevant_chunks)
 
             # Send metadata first
             metadata = {
                 "type": "metadata",
                 "sources": sources,
-                "confidence": float(avg_similarity),
+                "confidence": avg_similarity,
                 "chunks_used": len(relevant_chunks)
             }
             yield f"data: {json.dumps(metadata)}\n\n"
@@ -1,11 +1,26 @@
 import os
 import json
 import pickle
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import logging
+
+# Pin BLAS/OpenMP thread pools before numpy and torch are imported. More threads
+# speed up batch encoding during ingestion but hurt tail latency when several
+# requests encode concurrently, so default to half the available cores.
+EMBEDDING_NUM_THREADS = max(1, (os.cpu_count() or 2) // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(EMBEDDING_NUM_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(EMBEDDING_NUM_THREADS))
+
 import numpy as np
-from datetime import datetime
+from datetime import datetime, date
 
 # Vector database imports
 try:
@@ -24,14 +39,129 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logging.warning("SentenceTransformers not available. Install with: pip install sentence-transformers")
 
+# Optional approximate nearest-neighbour index for the in-memory fallback
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# Optional JIT for the brute-force similarity scan
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional ONNX Runtime embedding backend
+try:
+    from fastembed import TextEmbedding
+    FASTEMBED_AVAILABLE = True
+except ImportError:
+    FASTEMBED_AVAILABLE = False
+
 from document_loader import DocumentLoader, DocumentChunk
 from llm_wrapper import LLMWrapper
-from soap_parser import SOAPParser, SOAPSection
+from soap_parser import SOAPSection, get_default_parser
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Texts per forward pass when batch-encoding chunks during ingestion
+EMBEDDING_BATCH_SIZE = 64
+
+# Chunks per Chroma add/upsert call; very large payloads serialize poorly
+CHROMA_WRITE_BATCH_SIZE = 2048
+
+# Texts per shard when ingestion embeddings are spread over several workers
+EMBEDDING_SHARD_SIZE = 512
+
+class _LRUCache:
+    """Small thread-safe LRU mapping used for query embeddings"""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+# Query embeddings shared by every engine, keyed by (backend:model, query text)
+_QUERY_EMBEDDING_CACHE = _LRUCache(maxsize=1024)
+
+# Per-process model used by embedding worker processes
+_worker_embedding_model = None
+
+def _load_worker_embedding_model(model_name: str, backend: str, num_threads: int, onnx_cache_dir: Path):
+    """Load a CPU embedding model for a worker process or Ray actor"""
+    if backend == "fastembed":
+        return FastEmbedModel(model_name, cache_dir=onnx_cache_dir, threads=num_threads)
+    
+    import torch
+    torch.set_num_threads(num_threads)
+    return SentenceTransformer(model_name, device="cpu")
+
+def _init_embedding_worker(model_name: str, backend: str, num_threads: int, onnx_cache_dir: Path):
+    """ProcessPoolExecutor initializer: load the model once per worker"""
+    global _worker_embedding_model
+    _worker_embedding_model = _load_worker_embedding_model(model_name, backend, num_threads, onnx_cache_dir)
+
+def _encode_shard(texts: List[str]) -> np.ndarray:
+    """Encode one shard of texts inside a worker process"""
+    return _worker_embedding_model.encode(
+        texts,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+        normalize_embeddings=True
+    )
+
+if NUMBA_AVAILABLE:
+    # reassoc/contract let LLVM vectorize the reduction with FMAs without assuming away -inf
+    @njit(parallel=True, fastmath={"reassoc", "contract"}, cache=True)
+    def _masked_dot_kernel(matrix, query, mask):
+        """Row-parallel dot products of unit vectors, with masked-out rows set to -inf"""
+        n, d = matrix.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            if not mask[i]:
+                out[i] = -np.inf
+                continue
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query[j]
+            out[i] = acc
+        return out
+
+class _RayEmbedActor:
+    """Ray Data batch UDF holding one embedding model per actor"""
+    
+    def __init__(self, model_name: str, backend: str, num_threads: int, onnx_cache_dir: Path):
+        self.model = _load_worker_embedding_model(model_name, backend, num_threads, onnx_cache_dir)
+    
+    def __call__(self, batch: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        batch["embedding"] = self.model.encode(
+            list(batch["text"]),
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            normalize_embeddings=True
+        )
+        return batch
+
 class RAGEngine:
     """Main RAG engine for client-specific document retrieval and generation"""
     
@@ -41,45 +171,105 @@ class RAGEngine:
         embedding_model: str = "all-MiniLM-L6-v2",
         vector_db_path: str = "data/vector_db",
         top_k: int = 5,
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        recency_window_days: Optional[int] = None,
+        embedding_backend: str = "sentence-transformers",
+        max_context_chars: Optional[int] = None,
+        embedding_workers: int = 1,
+        in_memory_quantize: bool = False,
+        in_memory_ann_threshold: int = 10_000
     ):
         self.data_dir = Path(data_dir)
         self.embedding_model_name = embedding_model
+        self.embedding_backend = embedding_backend
+        # Large ingestion jobs are sharded over this many CPU workers (Ray if installed, else processes)
+        self.embedding_workers = embedding_workers
+        self._embedding_pool = None
+        self._ray_failed = False
         self.vector_db_path = Path(vector_db_path)
         self.top_k = top_k
         self.similarity_threshold = similarity_threshold
+        # When set, only chunks dated within this many days are scored
+        self.recency_window_days = recency_window_days
+        # Optional cap on prompt context size; chunks past the budget are not sent to the LLM
+        self.max_context_chars = max_context_chars
+        # Settings for the in-memory fallback store used when ChromaDB is unavailable
+        self.in_memory_quantize = in_memory_quantize
+        self.in_memory_ann_threshold = in_memory_ann_threshold
         
         # Initialize components
         self.llm_wrapper = LLMWrapper()
         self.document_loader = DocumentLoader(data_dir, self.llm_wrapper)
-        self.soap_parser = SOAPParser()
+        self.soap_parser = get_default_parser()
         self.embedding_model = None
         self.vector_db = None
         
         # Initialize embedding model and vector database
         self._initialize_embedding_model()
         self._initialize_vector_database()
+        self._initialize_embed_cache()
         
         # Client-specific collections cache
         self.client_collections = {}
     
     def _initialize_embedding_model(self):
         """Initialize the sentence transformer model for embeddings"""
+        if self.embedding_backend == "fastembed":
+            if not FASTEMBED_AVAILABLE:
+                raise ImportError("fastembed required for the ONNX backend. Install with: pip install fastembed")
+            
+            try:
+                self.embedding_model = FastEmbedModel(
+                    self.embedding_model_name,
+                    cache_dir=self.data_dir / "onnx",
+                    threads=EMBEDDING_NUM_THREADS
+                )
+                logger.info(f"Loaded ONNX embedding model: {self.embedding_model.model_name} ({', '.join(self.embedding_model.providers)})")
+            except Exception as e:
+                logger.error(f"Error loading ONNX embedding model: {e}")
+                raise
+            return
+        
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError("SentenceTransformers required. Install with: pip install sentence-transformers")
         
+        self._configure_torch_threads()
+        device = self._select_device()
+        
         try:
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
-            logger.info(f"Loaded embedding model: {self.embedding_model_name}")
+            self.embedding_model = SentenceTransformer(self.embedding_model_name, device=device)
+            logger.info(f"Loaded embedding model: {self.embedding_model_name} on {device}")
         except Exception as e:
             logger.error(f"Error loading embedding model: {e}")
             raise
     
+    def _configure_torch_threads(self):
+        """Pin PyTorch intra-op threads; the default is often misconfigured inside servers"""
+        import torch
+        
+        torch.set_num_threads(EMBEDDING_NUM_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once per process, before any inter-op work has started
+            pass
+    
+    def _select_device(self) -> str:
+        """Pick the fastest available torch device for the embedding model"""
+        import torch
+        
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, "mps", None)
+        if mps is not None and mps.is_available():
+            return "mps"
+        return "cpu"
+    
     def _initialize_vector_database(self):
         """Initialize ChromaDB for vector storage"""
         if not CHROMA_AVAILABLE:
             logger.warning("ChromaDB not available, using in-memory fallback")
-            self.vector_db = InMemoryVectorDB()
+            self.vector_db = self._open_in_memory_db()
             return
         
         try:
@@ -96,7 +286,78 @@ class RAGEngine:
         except Exception as e:
             logger.error(f"Error initializing ChromaDB: {e}")
             logger.info("Falling back to in-memory vector storage")
-            self.vector_db = InMemoryVectorDB()
+            self.vector_db = self._open_in_memory_db()
+    
+    def _open_in_memory_db(self) -> "InMemoryVectorDB":
+        """Create the in-memory fallback store, reloading anything persisted earlier"""
+        vector_db = InMemoryVectorDB(
+            ann_threshold=self.in_memory_ann_threshold,
+            quantize=self.in_memory_quantize
+        )
+        vector_db.load(self.vector_db_path / "in_memory")
+        return vector_db
+    
+    def _initialize_embed_cache(self):
+        """Open the on-disk embedding cache keyed by (model, sha256 of content)"""
+        # Include the backend so ONNX and PyTorch vectors never mix
+        self._embed_cache_model = f"{self.embedding_backend}:{self.embedding_model_name}"
+        self._embed_cache_lock = threading.Lock()
+        self._embed_cache_conn = None
+        
+        try:
+            cache_dir = self.data_dir / "embed_cache"
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(cache_dir / "embeddings.sqlite3"), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, content_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, content_hash))"
+            )
+            conn.commit()
+            self._embed_cache_conn = conn
+        except Exception as e:
+            logger.warning(f"Embedding cache unavailable, embeddings will not be reused: {e}")
+    
+    def _embed_cache_lookup(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch cached embeddings for the given content hashes"""
+        if self._embed_cache_conn is None or not hashes:
+            return {}
+        
+        found = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        try:
+            with self._embed_cache_lock:
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(unique_hashes), 500):
+                    batch = unique_hashes[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._embed_cache_conn.execute(
+                        f"SELECT content_hash, vector FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                        [self._embed_cache_model, *batch]
+                    )
+                    for content_hash, vector in rows:
+                        found[content_hash] = np.frombuffer(vector, dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Error reading embedding cache: {e}")
+        return found
+    
+    def _embed_cache_write(self, entries: Dict[str, np.ndarray]):
+        """Store freshly computed embeddings as raw float32 bytes"""
+        if self._embed_cache_conn is None or not entries:
+            return
+        
+        try:
+            with self._embed_cache_lock:
+                self._embed_cache_conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, content_hash, vector) VALUES (?, ?, ?)",
+                    [
+                        (self._embed_cache_model, content_hash, np.asarray(vector, dtype=np.float32).tobytes())
+                        for content_hash, vector in entries.items()
+                    ]
+                )
+                self._embed_cache_conn.commit()
+        except Exception as e:
+            logger.warning(f"Error writing embedding cache: {e}")
     
     def _get_client_collection(self, client_id: str):
         """Get or create a ChromaDB collection for a specific client"""
@@ -106,28 +367,181 @@ class RAGEngine:
         collection_name = f"client_{client_id}"
         
         if collection_name not in self.client_collections:
-            try:
-                # Try to get existing collection
-                collection = self.chroma_client.get_collection(collection_name)
-            except Exception:
-                # Create new collection if it doesn't exist
-                collection = self.chroma_client.create_collection(
-                    name=collection_name,
-                    metadata={"client_id": client_id}
-                )
+            # Cosine space so Chroma distances match the `1 - distance` similarity used in ranking
+            collection = self.chroma_client.get_or_create_collection(
+                name=collection_name,
+                metadata={"client_id": client_id, "hnsw:space": "cosine"}
+            )
             
             self.client_collections[collection_name] = collection
         
         return self.client_collections[collection_name]
     
-    def embed_text(self, text: str) -> List[float]:
-        """Generate embedding for a text"""
+    def _recency_cutoff(self) -> Optional[int]:
+        """Oldest date ordinal inside the recency window, or None when no window is set"""
+        if self.recency_window_days is None:
+            return None
+        return date.today().toordinal() - self.recency_window_days
+    
+    def _build_where_clause(self, meeting_ids: Optional[List[str]] = None) -> Optional[Dict]:
+        """Build a Chroma metadata filter so candidate pruning happens inside the index"""
+        clauses = []
+        if meeting_ids:
+            clauses.append({"meeting_id": {"$in": meeting_ids}})
+        cutoff = self._recency_cutoff()
+        if cutoff is not None:
+            clauses.append({"date_ordinal": {"$gte": cutoff}})
+        
+        if not clauses:
+            return None
+        if len(clauses) == 1:
+            return clauses[0]
+        return {"$and": clauses}
+    
+    def embed_text(self, text: str) -> np.ndarray:
+        """Generate a float32 embedding for a text (empty array on failure)"""
         try:
-            embedding = self.embedding_model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
+            embedding = self.embedding_model.encode(
+                text,
+                convert_to_tensor=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            return np.asarray(embedding, dtype=np.float32)
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
-            return []
+            return np.empty(0, dtype=np.float32)
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a retrieval query, reusing the result for repeated queries"""
+        key = (self._embed_cache_model, query)
+        embedding = _QUERY_EMBEDDING_CACHE.get(key)
+        if embedding is None:
+            embedding = self.embed_text(query)
+            if embedding.size == 0:
+                return embedding
+            # Shared across callers, so make sure nobody mutates it in place
+            embedding.setflags(write=False)
+            _QUERY_EMBEDDING_CACHE.put(key, embedding)
+        return embedding
+    
+    def embed_queries(self, queries: List[str]) -> None:
+        """Encode uncached queries in one batch and store them in the query embedding cache"""
+        pending = list(dict.fromkeys(
+            query for query in queries
+            if _QUERY_EMBEDDING_CACHE.get((self._embed_cache_model, query)) is None
+        ))
+        if not pending:
+            return
+        
+        try:
+            embeddings = self.embedding_model.encode(
+                pending,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+                normalize_embeddings=True
+            )
+        except Exception as e:
+            # embed_query falls back to encoding each query on its own
+            logger.error(f"Error generating query embeddings: {e}")
+            return
+        
+        for query, embedding in zip(pending, np.asarray(embeddings, dtype=np.float32)):
+            embedding.setflags(write=False)
+            _QUERY_EMBEDDING_CACHE.put((self._embed_cache_model, query), embedding)
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate an (N, D) float32 embedding matrix, encoding only texts missing from the cache"""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        cached = self._embed_cache_lookup(hashes)
+        
+        # Encode each distinct uncached text once, in a single batched call
+        misses = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in cached:
+                misses.setdefault(content_hash, text)
+        
+        if misses:
+            miss_texts = list(misses.values())
+            try:
+                embeddings = None
+                if self.embedding_workers > 1 and len(miss_texts) > EMBEDDING_SHARD_SIZE:
+                    try:
+                        embeddings = self._encode_parallel(miss_texts)
+                    except Exception as e:
+                        logger.warning(f"Parallel embedding failed, encoding in-process instead: {e}")
+                if embeddings is None:
+                    embeddings = self.embedding_model.encode(
+                        miss_texts,
+                        batch_size=EMBEDDING_BATCH_SIZE,
+                        convert_to_numpy=True,
+                        show_progress_bar=False,
+                        normalize_embeddings=True
+                    )
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {e}")
+                return np.empty((0, 0), dtype=np.float32)
+            
+            computed = dict(zip(misses.keys(), embeddings))
+            self._embed_cache_write(computed)
+            cached.update(computed)
+        
+        logger.info(f"Embedded {len(texts)} texts ({len(texts) - len(misses)} from cache)")
+        return np.vstack([cached[content_hash] for content_hash in hashes]).astype(np.float32, copy=False)
+    
+    def _encode_parallel(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in shards across worker actors/processes, preserving input order"""
+        threads_per_worker = max(1, EMBEDDING_NUM_THREADS // self.embedding_workers)
+        model_args = (self.embedding_model_name, self.embedding_backend, threads_per_worker, self.data_dir / "onnx")
+        
+        embeddings = self._encode_with_ray(texts, model_args)
+        if embeddings is not None:
+            return embeddings
+        
+        if self._embedding_pool is None:
+            # Spawn rather than fork so workers don't inherit initialized torch/OpenMP state
+            self._embedding_pool = ProcessPoolExecutor(
+                max_workers=self.embedding_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embedding_worker,
+                initargs=model_args
+            )
+        
+        shards = [texts[start:start + EMBEDDING_SHARD_SIZE] for start in range(0, len(texts), EMBEDDING_SHARD_SIZE)]
+        return np.vstack(list(self._embedding_pool.map(_encode_shard, shards)))
+    
+    def _encode_with_ray(self, texts: List[str], model_args: Tuple) -> Optional[np.ndarray]:
+        """Encode texts on Ray Data actors; None when Ray is not installed or the job fails"""
+        if self._ray_failed:
+            return None
+        
+        # Imported lazily so single-process engines never pay for loading Ray
+        try:
+            import ray.data
+        except ImportError:
+            self._ray_failed = True
+            return None
+        
+        try:
+            dataset = ray.data.from_items([{"row": i, "text": text} for i, text in enumerate(texts)])
+            rows = dataset.map_batches(
+                _RayEmbedActor,
+                fn_constructor_args=model_args,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                concurrency=self.embedding_workers
+            ).take_all()
+            embeddings = np.empty((len(texts), len(rows[0]["embedding"])), dtype=np.float32)
+            for row in rows:
+                embeddings[row["row"]] = row["embedding"]
+            return embeddings
+        except Exception as e:
+            logger.warning(f"Ray embedding failed, falling back to local worker processes: {e}")
+            self._ray_failed = True
+            return None
     
     def ingest_client_documents(self, client_id: str, force_reprocess: bool = False) -> bool:
         """Ingest all documents for a specific client into vector database"""
@@ -144,79 +558,60 @@ class RAGEngine:
             # Get client collection
             collection = self._get_client_collection(client_id)
 
+            # Skip chunks that are already stored before paying for their embeddings
+            if CHROMA_AVAILABLE and not force_reprocess:
+                existing_ids = self._get_existing_ids(collection, [chunk.chunk_id for chunk in chunks])
+                chunks = [chunk for chunk in chunks if chunk.chunk_id not in existing_ids]
+                if not chunks:
+                    logger.info(f"All documents for client {client_id} already exist in vector DB")
+                    return True
+
             # Prepare data for batch insertion
             chunk_ids = []
             embeddings = []
             documents = []
             metadatas = []
 
+            # Reuse embeddings already attached to chunks and batch-encode only the rest
+            pending = [i for i, chunk in enumerate(chunks) if chunk.embedding is None]
+            if pending:
+                new_embeddings = self.embed_texts([chunks[i].content for i in pending])
+                for i, embedding in zip(pending, new_embeddings):
+                    chunks[i].embedding = embedding
+
             for chunk in chunks:
-                # Generate embedding
-                if chunk.embedding is None:
-                    embedding = self.embed_text(chunk.content)
-                    if not embedding:
-                        continue
-                else:
-                    embedding = chunk.embedding
+                # Skip chunks whose embedding failed
+                if chunk.embedding is None or len(chunk.embedding) == 0:
+                    continue
 
                 chunk_ids.append(chunk.chunk_id)
-                embeddings.append(embedding)
+                embeddings.append(chunk.embedding)
                 documents.append(chunk.content)
                 metadatas.append(chunk.metadata)
 
+            if not chunk_ids:
+                logger.warning(f"No chunks could be embedded for client {client_id}")
+                return False
+
+            # Keep embeddings as one contiguous float32 matrix, which Chroma accepts directly
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+
             # DEBUG: Dump processed chunks and metadata to local JSON for inspection
-            import json
-            with open(f"debug_{client_id}_chunks.json", "w", encoding="utf-8") as debug_file:
-                json.dump([
-                    {
-                        "chunk_id": chunk_ids[i],
-                        "content": documents[i][:200],
-                        "metadata": metadatas[i]
-                    }
-                    for i in range(len(chunk_ids))
-                ], debug_file, indent=2)
+            if os.environ.get("RAG_DEBUG_CHUNKS", "").strip().lower() in {"1", "true", "yes"} or logger.isEnabledFor(logging.DEBUG):
+                self._write_debug_chunks(client_id, chunk_ids, documents, metadatas)
 
             if CHROMA_AVAILABLE:
-                # Check if documents already exist and remove them
-                existing_ids = set()
-                try:
-                    existing_data = collection.get()
-                    existing_ids = set(existing_data['ids'])
-                except Exception:
-                    pass
-
-                # Remove existing documents if reprocessing
-                if force_reprocess and existing_ids:
-                    ids_to_delete = [id for id in chunk_ids if id in existing_ids]
-                    if ids_to_delete:
-                        collection.delete(ids=ids_to_delete)
-
-                # Filter out existing documents if not reprocessing
-                if not force_reprocess:
-                    new_data = []
-                    for i, chunk_id in enumerate(chunk_ids):
-                        if chunk_id not in existing_ids:
-                            new_data.append((chunk_id, embeddings[i], documents[i], metadatas[i]))
-
-                    if new_data:
-                        chunk_ids, embeddings, documents, metadatas = zip(*new_data)
-                    else:
-                        logger.info(f"All documents for client {client_id} already exist in vector DB")
-                        return True
-
-                # Ensure Chroma-compatible metadata values
-                for meta in metadatas:
-                    for key, value in meta.items():
-                        if isinstance(value, list):
-                            meta[key] = ", ".join(str(v) for v in value)
-
-                # Add documents to collection
-                collection.add(
-                    ids=chunk_ids,
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas
-                )
+                # Metadata arrives Chroma-compatible (flattened by DocumentLoader)
+                # Reprocessing overwrites existing ids with a server-side upsert
+                write = collection.upsert if force_reprocess else collection.add
+                for start in range(0, len(chunk_ids), CHROMA_WRITE_BATCH_SIZE):
+                    end = start + CHROMA_WRITE_BATCH_SIZE
+                    write(
+                        ids=chunk_ids[start:end],
+                        embeddings=embeddings[start:end],
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end]
+                    )
             else:
                 # Use in-memory fallback
                 for i, chunk_id in enumerate(chunk_ids):
@@ -227,6 +622,7 @@ class RAGEngine:
                         content=documents[i],
                         metadata=metadatas[i]
                     )
+                self.vector_db.save(client_id, self.vector_db_path / "in_memory")
 
             logger.info(f"Successfully ingested {len(chunk_ids)} chunks for client {client_id}")
             return True
@@ -235,6 +631,32 @@ class RAGEngine:
             logger.error(f"Error ingesting documents for client {client_id}: {e}")
             return False
     
+    def _get_existing_ids(self, collection, chunk_ids: List[str]) -> set:
+        """Return which of the given ids are already stored, without scanning the whole collection"""
+        existing = set()
+        try:
+            # Query in slices so very large ingests stay under SQLite's bound-variable limit
+            for start in range(0, len(chunk_ids), CHROMA_WRITE_BATCH_SIZE):
+                batch = chunk_ids[start:start + CHROMA_WRITE_BATCH_SIZE]
+                existing.update(collection.get(ids=batch, include=[])['ids'])
+        except Exception:
+            return set()
+        return existing
+    
+    def _write_debug_chunks(self, client_id: str, chunk_ids: List[str], documents: List[str], metadatas: List[Dict]):
+        """Stream a JSON array of chunk previews to disk without building it in memory"""
+        with open(f"debug_{client_id}_chunks.json", "w", encoding="utf-8") as debug_file:
+            debug_file.write("[\n")
+            for i in range(len(chunk_ids)):
+                if i:
+                    debug_file.write(",\n")
+                json.dump({
+                    "chunk_id": chunk_ids[i],
+                    "content": documents[i][:200],
+                    "metadata": metadatas[i]
+                }, debug_file, indent=2)
+            debug_file.write("\n]\n")
+    
     def retrieve_relevant_chunks(
         self,
         client_id: str,
@@ -415,8 +837,8 @@ class RAGEngine:
             initial_top_k = min(top_k * 3, 20)  # Get more candidates for re-ranking
 
             # Generate query embedding
-            query_embedding = self.embed_text(query)
-            if not query_embedding:
+            query_embedding = self.embed_query(query)
+            if query_embedding.size == 0:
                 return []
 
             # Extract query entities and analyze for SOAP relevance
@@ -429,29 +851,33 @@ class RAGEngine:
             collection = self._get_client_collection(client_id)
 
             if CHROMA_AVAILABLE:
-                # Prepare where clause for meeting filtering
-                where_clause = None
-                if meeting_ids:
-                    where_clause = {"meeting_id": {"$in": meeting_ids}}
+                # Push meeting/recency filtering down into Chroma
+                where_clause = self._build_where_clause(meeting_ids)
 
-                # Query the collection with expanded results
+                # Query the collection with expanded results (skip echoing embeddings back)
                 results = collection.query(
-                    query_embeddings=[query_embedding],
+                    query_embeddings=[query_embedding.tolist()],
                     n_results=initial_top_k,
-                    where=where_clause
+                    where=where_clause,
+                    include=["documents", "metadatas", "distances"]
                 )
 
-                # Format raw results
+                # Format raw results, walking the parallel result lists once
                 relevant_chunks = []
                 if results['documents'] and results['documents'][0]:
-                    for i in range(len(results['documents'][0])):
-                        chunk = {
-                            'content': results['documents'][0][i],
-                            'metadata': results['metadatas'][0][i],
-                            'distance': results['distances'][0][i] if results['distances'] else 0,
-                            'id': results['ids'][0][i]
+                    documents = results['documents'][0]
+                    distances = results['distances'][0] if results['distances'] else [0] * len(documents)
+                    relevant_chunks = [
+                        {
+                            'content': document,
+                            'metadata': metadata,
+                            'distance': distance,
+                            'id': chunk_id
                         }
-                        relevant_chunks.append(chunk)
+                        for document, metadata, distance, chunk_id in zip(
+                            documents, results['metadatas'][0], distances, results['ids'][0]
+                        )
+                    ]
 
                 logger.info(f"Retrieved {len(relevant_chunks)} raw chunks for query before re-ranking.")
 
@@ -460,7 +886,9 @@ class RAGEngine:
                 relevant_chunks = self.vector_db.query(
                     client_id=client_id,
                     query_embedding=query_embedding,
-                    top_k=initial_top_k
+                    meeting_ids=meeting_ids,
+                    top_k=initial_top_k,
+                    min_date_ordinal=self._recency_cutoff()
                 )
                 logger.info(f"Retrieved {len(relevant_chunks)} raw chunks for query before re-ranking (in-memory fallback).")
 
@@ -514,6 +942,7 @@ class RAGEngine:
                 }
 
             # Step 2: Construct context and prompt
+            relevant_chunks = self.select_context_chunks(relevant_chunks)
             context = "\n\n".join(chunk['content'] for chunk in relevant_chunks)
             sources = [
                 {
@@ -529,15 +958,12 @@ class RAGEngine:
             response = self.llm_wrapper.generate_text(prompt)
 
             # Step 4: Score
-            avg_similarity = np.mean([
-                max(0.0, min(1.0, 1 - chunk.get('distance', 1)))
-                for chunk in relevant_chunks
-            ])
+            avg_similarity = self.compute_confidence(relevant_chunks)
 
             return {
                 'answer': response,
                 'sources': sources,
-                'confidence': float(avg_similarity),
+                'confidence': avg_similarity,
                 'chunks_used': len(relevant_chunks)
             }
 
@@ -550,20 +976,32 @@ class RAGEngine:
                 'chunks_used': 0
             }
     
-    def _create_rag_prompt(self, query: str, context: str, client_id: str) -> str:
-        """Create a prompt for the LLM using retrieved context"""
-        prompt = f"""You are a helpful assistant for a counselor. You have access to meeting notes for client {client_id}.
-
-Based on the following meeting notes, please answer the counselor's question. Be specific and reference relevant details from the notes. If you can't find the answer in the provided context, say so clearly.
-
-Meeting Notes Context:
-{context}
-
-Counselor's Question: {query}
-
-Please provide a helpful and accurate response based only on the information in the meeting notes above."""
-
-        return prompt
+    def generate_responses(
+        self,
+        client_id: str,
+        queries: List[str],
+        meeting_ids: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Answer several queries, embedding them in a single forward pass"""
+        self.embed_queries(queries)
+        return [self.generate_response(client_id, query, meeting_ids=meeting_ids) for query in queries]
+    
+    def select_context_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        """Keep the leading chunks that fit in the context budget (always at least one)"""
+        if self.max_context_chars is None:
+            return chunks
+        
+        used = 0
+        for i, chunk in enumerate(chunks):
+            used += len(chunk['content']) + 2  # account for the "\n\n" separator
+            if i and used > self.max_context_chars:
+                return chunks[:i]
+        return chunks
+    
+    def compute_confidence(self, chunks: List[Dict]) -> float:
+        """Average clamped similarity of the chunks used to answer"""
+        distances = np.fromiter((chunk.get('distance', 1) for chunk in chunks), dtype=np.float32, count=len(chunks))
+        return float(np.clip(1 - distances, 0.0, 1.0).mean())
     
     def get_client_summary(self, client_id: str) -> Dict:
         """Get summary information about a client's documents"""
@@ -595,55 +1033,407 @@ Please provide a helpful and accurate response based only on the information in
 class InMemoryVectorDB:
     """Fallback in-memory vector database when ChromaDB is not available"""
     
-    def __init__(self):
-        self.data = {}  # client_id -> list of chunks
+    # Rows per int32 block when scoring a quantized matrix, bounding temporary memory
+    QUANTIZED_BLOCK_ROWS = 65536
+    # Above this many rows the float32 scan uses the fused Numba kernel when available
+    NUMBA_MIN_ROWS = 10_000
+    
+    def __init__(self, ann_threshold: int = 10_000, quantize: bool = False):
+        # Clients with at least this many chunks are searched with HNSW when hnswlib is installed
+        self.ann_threshold = ann_threshold
+        # Store new matrices as int8 with a per-row scale (4x less memory than float32)
+        self.quantize = quantize
+        
+        # Struct-of-arrays per client: row i of the matrix belongs to ids[i]
+        self.ids = {}        # client_id -> list of chunk ids
+        self.contents = {}   # client_id -> list of chunk texts
+        self.metadatas = {}  # client_id -> list of metadata dicts
+        self.positions = {}  # client_id -> {chunk_id: row}
+        self.meeting_ids = {}  # client_id -> list of meeting ids, for vectorized filtering
+        self.matrices = {}   # client_id -> (N, D) float32 matrix of unit vectors
+        self.pending = {}    # client_id -> rows added since the matrix was last stacked
+        self.scales = {}     # client_id -> per-row float32 scales, only for int8 matrices
+        self._meeting_arrays = {}  # client_id -> cached np.ndarray of meeting_ids
+        self._date_ordinal_arrays = {}  # client_id -> cached np.ndarray of metadata date ordinals
+        self.indexes = {}    # client_id -> hnswlib.Index labelled by matrix row
+        self._indexed_rows = {}  # client_id -> number of leading rows added to the index
+        self._dirty_rows = {}    # client_id -> indexed rows overwritten since
     
     def add(self, client_id: str, chunk_id: str, embedding: List[float], content: str, metadata: Dict):
         """Add a chunk to the database"""
-        if client_id not in self.data:
-            self.data[client_id] = []
+        # Store unit vectors so cosine similarity is a plain dot product at query time
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        
+        ids = self.ids.setdefault(client_id, [])
+        contents = self.contents.setdefault(client_id, [])
+        metadatas = self.metadatas.setdefault(client_id, [])
+        meeting_ids = self.meeting_ids.setdefault(client_id, [])
+        positions = self.positions.setdefault(client_id, {})
+        pending = self.pending.setdefault(client_id, [])
+        
+        # Replace an existing chunk with the same ID in place
+        self._meeting_arrays.pop(client_id, None)
+        self._date_ordinal_arrays.pop(client_id, None)
+        row = positions.get(chunk_id)
+        if row is not None:
+            contents[row] = content
+            metadatas[row] = metadata
+            meeting_ids[row] = metadata.get('meeting_id')
+            self._set_row(client_id, row, vector)
+            return
+        
+        positions[chunk_id] = len(ids)
+        ids.append(chunk_id)
+        contents.append(content)
+        metadatas.append(metadata)
+        meeting_ids.append(metadata.get('meeting_id'))
+        pending.append(vector)
+    
+    def _set_row(self, client_id: str, row: int, vector: np.ndarray):
+        """Overwrite the embedding stored at a row, wherever it currently lives"""
+        matrix = self.matrices.get(client_id)
+        stacked_rows = 0 if matrix is None else len(matrix)
+        if row >= stacked_rows:
+            self.pending[client_id][row - stacked_rows] = vector
+            return
+        
+        if not matrix.flags.writeable:
+            # Copy-on-write for matrices memory-mapped by load()
+            matrix = np.array(matrix)
+            self.matrices[client_id] = matrix
         
-        chunk_data = {
-            'id': chunk_id,
-            'embedding': np.array(embedding),
-            'content': content,
-            'metadata': metadata
-        }
+        if client_id in self.scales:
+            quantized, scales = self._quantize_rows(vector)
+            matrix[row] = quantized[0]
+            self.scales[client_id][row] = scales[0]
+        else:
+            matrix[row] = vector
         
-        # Remove existing chunk with same ID
-        self.data[client_id] = [c for c in self.data[client_id] if c['id'] != chunk_id]
-        self.data[client_id].append(chunk_data)
+        if row < self._indexed_rows.get(client_id, 0):
+            self._dirty_rows.setdefault(client_id, set()).add(row)
     
-    def query(self, client_id: str, query_embedding: List[float], meeting_id: str = None, top_k: int = 5) -> List[Dict]:
+    def _get_matrix(self, client_id: str) -> Optional[np.ndarray]:
+        """Return the client's embedding matrix, stacking rows added since the last query"""
+        matrix = self.matrices.get(client_id)
+        pending = self.pending.get(client_id)
+        if pending:
+            block = np.vstack(pending)
+            if client_id in self.scales or (matrix is None and self.quantize):
+                block, block_scales = self._quantize_rows(block)
+                scales = self.scales.get(client_id)
+                self.scales[client_id] = block_scales if scales is None else np.concatenate([scales, block_scales])
+            
+            matrix = block if matrix is None else np.vstack([matrix, block])
+            self.matrices[client_id] = matrix
+            pending.clear()
+        return matrix
+    
+    @staticmethod
+    def _quantize_rows(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric per-row int8 quantization, returning (int8 rows, float32 scales)"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    
+    def _rows_as_float(self, client_id: str, matrix: np.ndarray, rows) -> np.ndarray:
+        """Return selected rows as float32, dequantizing int8 storage"""
+        block = matrix[rows]
+        scales = self.scales.get(client_id)
+        if scales is None:
+            return block
+        return block.astype(np.float32) * scales[rows][:, None]
+    
+    def _similarities(self, client_id: str, matrix: np.ndarray, query_vec: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of the (unit) query against every stored row, -inf where masked out"""
+        scales = self.scales.get(client_id)
+        if scales is None:
+            if NUMBA_AVAILABLE and len(matrix) > self.NUMBA_MIN_ROWS:
+                # Fuses the meeting mask into one parallel pass over the matrix
+                if mask is None:
+                    mask = np.ones(len(matrix), dtype=np.bool_)
+                return _masked_dot_kernel(np.ascontiguousarray(matrix), query_vec.astype(np.float32), mask)
+            
+            # Rows are unit vectors, so one matrix-vector product gives every cosine similarity
+            similarities = matrix @ query_vec
+            return similarities if mask is None else np.where(mask, similarities, -np.inf)
+        
+        # int8 x int8 products accumulated in int32, then rescaled
+        quantized_query, query_scale = self._quantize_rows(query_vec)
+        quantized_query = quantized_query[0].astype(np.int32)
+        similarities = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), self.QUANTIZED_BLOCK_ROWS):
+            end = start + self.QUANTIZED_BLOCK_ROWS
+            similarities[start:end] = (matrix[start:end].astype(np.int32) @ quantized_query) * scales[start:end]
+        similarities *= query_scale[0]
+        return similarities if mask is None else np.where(mask, similarities, -np.inf)
+    
+    def _get_meeting_array(self, client_id: str) -> np.ndarray:
+        """Return the client's meeting ids as an array aligned with the matrix rows"""
+        meeting_array = self._meeting_arrays.get(client_id)
+        if meeting_array is None:
+            meeting_array = np.array(self.meeting_ids[client_id], dtype=object)
+            self._meeting_arrays[client_id] = meeting_array
+        return meeting_array
+    
+    def _get_date_ordinal_array(self, client_id: str) -> np.ndarray:
+        """Return the chunks' date ordinals aligned with the matrix rows (-1 when undated)"""
+        ordinals = self._date_ordinal_arrays.get(client_id)
+        if ordinals is None:
+            ordinals = np.fromiter(
+                (metadata.get('date_ordinal', -1) for metadata in self.metadatas[client_id]),
+                dtype=np.int64,
+                count=len(self.metadatas[client_id])
+            )
+            self._date_ordinal_arrays[client_id] = ordinals
+        return ordinals
+    
+    def query(
+        self,
+        client_id: str,
+        query_embedding: List[float],
+        meeting_id: str = None,
+        top_k: int = 5,
+        meeting_ids: Optional[List[str]] = None,
+        min_date_ordinal: Optional[int] = None
+    ) -> List[Dict]:
         """Query the database for similar chunks"""
-        if client_id not in self.data:
+        matrix = self._get_matrix(client_id)
+        if matrix is None or len(matrix) == 0:
             return []
         
-        query_vec = np.array(query_embedding)
-        results = []
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vec)
+        if query_norm > 0:
+            query_vec = query_vec / query_norm
+        
+        # Filter by meeting ID(s) if specified by masking out every other row
+        wanted = list(meeting_ids or [])
+        if meeting_id:
+            wanted.append(meeting_id)
+        mask = None
+        if wanted:
+            mask = np.isin(self._get_meeting_array(client_id), wanted)
+        
+        # Recency window, matching Chroma's date_ordinal $gte filter (undated chunks are excluded)
+        if min_date_ordinal is not None:
+            recent = self._get_date_ordinal_array(client_id) >= min_date_ordinal
+            mask = recent if mask is None else mask & recent
+        candidates = len(matrix) if mask is None else int(mask.sum())
+        
+        k = min(top_k, candidates)
+        if k <= 0:
+            return []
+        
+        top_rows = None
+        if HNSWLIB_AVAILABLE and len(matrix) >= self.ann_threshold:
+            top_rows, top_distances = self._ann_top_rows(client_id, matrix, query_vec, k, mask)
+        
+        if top_rows is None:
+            similarities = self._similarities(client_id, matrix, query_vec, mask)
+            
+            # Partial selection of the k best rows, then sort only those
+            if k < len(similarities):
+                top_rows = np.argpartition(-similarities, k - 1)[:k]
+            else:
+                top_rows = np.arange(len(similarities))
+            top_rows = top_rows[np.argsort(-similarities[top_rows], kind='stable')]
+            top_distances = 1 - similarities[top_rows]
+        
+        ids = self.ids[client_id]
+        contents = self.contents[client_id]
+        metadatas = self.metadatas[client_id]
+        return [
+            {
+                'content': contents[row],
+                'metadata': metadatas[row],
+                'distance': float(distance),
+                'id': ids[row]
+            }
+            for row, distance in zip(top_rows[:k], top_distances[:k])
+        ]
+    
+    def _get_index(self, client_id: str, matrix: np.ndarray):
+        """Return the client's HNSW index, adding rows stacked or overwritten since the last query"""
+        index = self.indexes.get(client_id)
+        if index is None:
+            index = hnswlib.Index(space='cosine', dim=matrix.shape[1])
+            index.init_index(max_elements=max(len(matrix), 1024), ef_construction=200, M=16)
+            self.indexes[client_id] = index
+            self._indexed_rows[client_id] = 0
+        
+        indexed = self._indexed_rows[client_id]
+        dirty = sorted(self._dirty_rows.pop(client_id, ()))
+        if dirty:
+            # Re-adding an existing label replaces its vector
+            index.add_items(self._rows_as_float(client_id, matrix, dirty), np.asarray(dirty))
+        
+        if len(matrix) > indexed:
+            if len(matrix) > index.get_max_elements():
+                index.resize_index(max(len(matrix), 2 * index.get_max_elements()))
+            index.add_items(self._rows_as_float(client_id, matrix, slice(indexed, None)), np.arange(indexed, len(matrix)))
+            self._indexed_rows[client_id] = len(matrix)
         
-        for chunk in self.data[client_id]:
-            # Filter by meeting ID if specified
-            if meeting_id and chunk['metadata'].get('meeting_id') != meeting_id:
+        return index
+    
+    def _ann_top_rows(self, client_id: str, matrix: np.ndarray, query_vec: np.ndarray, k: int, mask: Optional[np.ndarray]):
+        """Approximate top-k rows via HNSW; returns (None, None) if filtering leaves too few hits"""
+        index = self._get_index(client_id, matrix)
+        
+        # Over-fetch when a meeting filter will discard some of the neighbours
+        fetch = min(k * 3 if mask is not None else k, len(matrix))
+        index.set_ef(max(50, fetch))
+        labels, distances = index.knn_query(query_vec, k=fetch)
+        labels, distances = labels[0], distances[0]
+        
+        if mask is not None:
+            keep = mask[labels]
+            labels, distances = labels[keep], distances[keep]
+            if len(labels) < k:
+                # Filter is too selective for the over-fetch; use the exact scan instead
+                return None, None
+        
+        return labels[:k].astype(np.int64), distances[:k]
+    
+    def save(self, client_id: str, directory: Path):
+        """Persist a client's vectors as .npy plus a JSON sidecar (no pickling)"""
+        matrix = self._get_matrix(client_id)
+        if matrix is None:
+            return
+        
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Each file is swapped in whole; load() rejects a matrix and sidecar that still disagree
+        with self._replacing(directory / f"{client_id}.npy") as tmp_path, open(tmp_path, "wb") as f:
+            np.save(f, matrix)
+        if client_id in self.scales:
+            with self._replacing(directory / f"{client_id}.scales.npy") as tmp_path, open(tmp_path, "wb") as f:
+                np.save(f, self.scales[client_id])
+        if client_id in self.indexes:
+            with self._replacing(directory / f"{client_id}.hnsw") as tmp_path:
+                self._get_index(client_id, matrix).save_index(str(tmp_path))
+        with self._replacing(directory / f"{client_id}.json") as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                'ids': self.ids[client_id],
+                'contents': self.contents[client_id],
+                'metadatas': self.metadatas[client_id]
+            }, f, default=str)
+    
+    @staticmethod
+    @contextmanager
+    def _replacing(path: Path):
+        """Yield a temporary sibling path and atomically move it over path once written"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def load(self, directory: Path):
+        """Load every persisted client, memory-mapping the embedding matrices"""
+        directory = Path(directory)
+        if not directory.exists():
+            return
+        
+        for matrix_path in directory.glob("*.npy"):
+            client_id = matrix_path.stem
+            if client_id.endswith(".scales"):
+                continue
+            sidecar_path = matrix_path.with_suffix(".json")
+            scales_path = directory / f"{client_id}.scales.npy"
+            try:
+                with open(sidecar_path, "r", encoding="utf-8") as f:
+                    sidecar = json.load(f)
+                matrix = np.load(matrix_path, mmap_mode='r')
+                scales = np.load(scales_path) if scales_path.exists() else None
+            except Exception as e:
+                logger.error(f"Error loading in-memory vectors for client {client_id}: {e}")
                 continue
             
-            # Calculate cosine similarity
-            chunk_vec = chunk['embedding']
-            similarity = np.dot(query_vec, chunk_vec) / (np.linalg.norm(query_vec) * np.linalg.norm(chunk_vec))
-            distance = 1 - similarity
+            # Files from an interrupted save can disagree; serving them would misalign rows
+            rows = len(matrix)
+            if len(sidecar['ids']) != rows or (matrix.dtype == np.int8 and (scales is None or len(scales) != rows)):
+                logger.error(
+                    f"Skipping in-memory vectors for client {client_id}: {rows} matrix rows, "
+                    f"{len(sidecar['ids'])} sidecar ids, {'no' if scales is None else len(scales)} scales"
+                )
+                continue
             
-            results.append({
-                'content': chunk['content'],
-                'metadata': chunk['metadata'],
-                'distance': distance,
-                'id': chunk['id']
-            })
-        
-        # Sort by distance and return top_k
-        results.sort(key=lambda x: x['distance'])
-        return results[:top_k]
+            if matrix.dtype == np.int8:
+                self.scales[client_id] = scales
+            self.ids[client_id] = sidecar['ids']
+            self.contents[client_id] = sidecar['contents']
+            self.metadatas[client_id] = sidecar['metadatas']
+            self.meeting_ids[client_id] = [metadata.get('meeting_id') for metadata in sidecar['metadatas']]
+            self._meeting_arrays.pop(client_id, None)
+            self._date_ordinal_arrays.pop(client_id, None)
+            self.positions[client_id] = {chunk_id: row for row, chunk_id in enumerate(sidecar['ids'])}
+            self.matrices[client_id] = matrix
+            self.pending[client_id] = []
+            
+            index_path = matrix_path.with_suffix(".hnsw")
+            if HNSWLIB_AVAILABLE and index_path.exists():
+                try:
+                    index = hnswlib.Index(space='cosine', dim=matrix.shape[1])
+                    index.load_index(str(index_path), max_elements=max(len(matrix), 1024))
+                    self.indexes[client_id] = index
+                    self._indexed_rows[client_id] = index.get_current_count()
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable HNSW index for client {client_id}: {e}")
     
     def get_client_chunk_count(self, client_id: str) -> int:
         """Get number of chunks for a client"""
-        return len(self.data.get(client_id, []))
+        return len(self.ids.get(client_id, []))
 
+
+class FastEmbedModel:
+    """ONNX Runtime embedding backend exposing the subset of SentenceTransformer.encode we use"""
+    
+    def __init__(self, model_name: str, cache_dir: Optional[Path] = None, threads: Optional[int] = None):
+        # fastembed expects the fully qualified Hugging Face model name
+        if "/" not in model_name:
+            model_name = f"sentence-transformers/{model_name}"
+        self.model_name = model_name
+        
+        # Prefer CUDA when onnxruntime-gpu is installed; fastembed enables ORT_ENABLE_ALL graph optimization
+        import onnxruntime
+        providers = ["CPUExecutionProvider"]
+        if "CUDAExecutionProvider" in onnxruntime.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        self.providers = providers
+        
+        # The exported ONNX model is cached under cache_dir so it is only downloaded once
+        self.model = TextEmbedding(
+            model_name,
+            cache_dir=str(cache_dir) if cache_dir is not None else None,
+            threads=threads,
+            providers=providers
+        )
+    
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Embed a single text or a list of texts (other SentenceTransformer kwargs are ignored)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        # Smart batching: encode length-sorted texts so each batch pads to similar lengths,
+        # then restore the caller's order (SentenceTransformer does the same internally)
+        order = np.argsort([len(text) for text in texts], kind='stable')
+        sorted_embeddings = np.array(
+            list(self.model.embed([texts[i] for i in order], batch_size=batch_size)),
+            dtype=np.float32
+        )
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        
+        return embeddings[0] if single else embeddings
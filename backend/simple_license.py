@@ -2,8 +2,9 @@
 Simple License Manager - Trial expires October 1st, 2025
 """
 
-from datetime import datetime, date
-from typing import Dict, Any
+import time
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,34 +18,37 @@ class SimpleLicenseManager:
     def __init__(self):
         # Set trial end date - October 1st, 2025
         self.TRIAL_END_DATE = date(2025, 10, 1)
+        # Trial status only changes once a day, so it is computed once per calendar day
+        # Keyed by the timestamp of the next local midnight, so a hit costs one time.time() call
+        self._cache: Optional[Tuple[float, Dict[str, Any]]] = None
+    
+    def _current_status(self) -> Dict[str, Any]:
+        """Return the cached status for today, recomputing it after local midnight"""
+        if self._cache is None or time.time() >= self._cache[0]:
+            today = date.today()
+            is_valid = today < self.TRIAL_END_DATE
+            next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+            self._cache = (next_midnight, {
+                'is_valid': is_valid,
+                'days_remaining': (self.TRIAL_END_DATE - today).days if is_valid else 0,
+                'trial_end_date': self.TRIAL_END_DATE.isoformat(),
+                'current_date': today.isoformat(),
+                'status': 'active' if is_valid else 'expired'
+            })
+        return self._cache[1]
         
     def is_trial_valid(self) -> bool:
         """Check if trial is still valid (before October 1st, 2025)"""
-        today = date.today()
-        return today < self.TRIAL_END_DATE
+        return self._current_status()['is_valid']
     
     def get_days_remaining(self) -> int:
         """Get number of days remaining in trial"""
-        today = date.today()
-        if today >= self.TRIAL_END_DATE:
-            return 0
-        
-        delta = self.TRIAL_END_DATE - today
-        return delta.days
+        return self._current_status()['days_remaining']
     
     def get_trial_status(self) -> Dict[str, Any]:
         """Get comprehensive trial status"""
-        today = date.today()
-        days_remaining = self.get_days_remaining()
-        is_valid = self.is_trial_valid()
-        
-        return {
-            'is_valid': is_valid,
-            'days_remaining': days_remaining,
-            'trial_end_date': self.TRIAL_END_DATE.isoformat(),
-            'current_date': today.isoformat(),
-            'status': 'active' if is_valid else 'expired'
-        }
+        # Callers add their own keys, so hand out a copy of the cached dict
+        return dict(self._current_status())
     
     def can_use_feature(self) -> tuple[bool, str]:
         """Check if user can use features (generic check for all features)"""
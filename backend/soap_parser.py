@@ -1,11 +1,79 @@
 import re
+import sys
+import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from itertools import islice
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any, ClassVar
+from dataclasses import dataclass, replace
 from enum import Enum
 
+# Optional linear-time regex engine; immune to backtracking blow-ups on long notes
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Optional Aho-Corasick automaton for multi-term keyword extraction
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_RE2_INLINE_FLAGS = ((re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.IGNORECASE, 'i'))
+
+# ASCII characters that re treats as \s but re2 does not
+_RE2_UNSAFE_ASCII = re.compile(r'[\x0b\x1c-\x1f]')
+
+def _re2_safe(text: str) -> bool:
+    r"""Whether re2 matches text exactly like re; its \s and \b only understand ASCII whitespace and words"""
+    return RE2_AVAILABLE and text.isascii() and _RE2_UNSAFE_ASCII.search(text) is None
+
+class _DualPattern:
+    """A re pattern plus an re2 compilation of it, when re2 is installed and accepts the syntax"""
+    __slots__ = ('re', 're2')
+    
+    def __init__(self, pattern: str, flags: int = 0):
+        self.re = re.compile(pattern, flags)
+        self.re2 = None
+        if RE2_AVAILABLE:
+            inline = ''.join(letter for flag, letter in _RE2_INLINE_FLAGS if flags & flag)
+            try:
+                self.re2 = re2.compile(f'(?{inline}){pattern}' if inline else pattern)
+            except re2.error:
+                pass
+    
+    def select(self, use_re2: bool):
+        """Return the re2 pattern when the text allows it (see _re2_safe), otherwise the re one"""
+        return self.re2 if use_re2 and self.re2 is not None else self.re
+
+def _compile(pattern: str, flags: int = 0) -> _DualPattern:
+    """Compile with re, and also with re2 for linear-time matching of ASCII text"""
+    return _DualPattern(pattern, flags)
+
+# Clinical/therapeutic terms surfaced from retrieval queries, in reporting order
+CLINICAL_TERMS = [
+    'anxiety', 'depression', 'trauma', 'ptsd', 'therapy', 'counseling',
+    'coping', 'stress', 'breakthrough', 'progress', 'setback', 'goals',
+    'relationship', 'family', 'work', 'career', 'emotional', 'feelings',
+    'mindfulness', 'homework', 'assignment', 'intervention', 'session'
+]
+
+if AHOCORASICK_AVAILABLE:
+    _CLINICAL_AUTOMATON = ahocorasick.Automaton()
+    for _index, _term in enumerate(CLINICAL_TERMS):
+        _CLINICAL_AUTOMATON.add_word(_term, _index)
+    _CLINICAL_AUTOMATON.make_automaton()
+
+# Per-chunk records drop their __dict__ where dataclass slots are supported (3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class SOAPSection(Enum):
     """SOAP note sections"""
     SUBJECTIVE = "subjective"
@@ -14,7 +82,7 @@ class SOAPSection(Enum):
     PLAN = "plan"
     UNSTRUCTURED = "unstructured"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SOAPContent:
     """Represents parsed SOAP note content"""
     subjective: str = ""
@@ -37,7 +105,7 @@ class SOAPContent:
         else:
             return self.unstructured
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SOAPChunk:
     """Represents a chunk from a SOAP note with enhanced metadata"""
     content: str
@@ -45,37 +113,92 @@ class SOAPChunk:
     section_content_full: str  # Full content of the section this chunk came from
     metadata: Dict[str, Any]
 
+# Common SOAP section patterns - flexible to handle variations.
+# Under MULTILINE, `$` already ends every lazy capture at the first line break, so the
+# captures exclude newlines explicitly and a failed start position costs one line, not the note.
+# Section terminators are plain groups rather than lookaheads so re2 accepts them;
+# only group 1 of the first match is used, so consuming the terminator is harmless.
+_SECTION_PATTERNS = {
+    section: [_compile(pattern, re.MULTILINE | re.DOTALL) for pattern in patterns]
+    for section, patterns in {
+        SOAPSection.SUBJECTIVE: [
+            r'(?i)^s\s*[:|-]?\s*([^\n]*?)(?:^[oa][:|-]|$)',
+            r'(?i)^subjective\s*[:|-]?\s*([^\n]*?)(?:^(?:objective|assessment)[:|-]|$)',
+            r'(?i)(?:^|\n)\s*subjective\s*[:|-]?\s*([^\n]*?)(?:\n\s*(?:objective|assessment)|$)',
+            r'(?i)client\s+(?:reports?|states?|says?)\s+([^\n]*?)(?:\n\s*(?:observed?|assessment|plan)|$)',
+        ],
+        SOAPSection.OBJECTIVE: [
+            r'(?i)^o\s*[:|-]?\s*([^\n]*?)(?:^[ap][:|-]|$)',
+            r'(?i)^objective\s*[:|-]?\s*([^\n]*?)(?:^(?:assessment|plan)[:|-]|$)',
+            r'(?i)(?:^|\n)\s*objective\s*[:|-]?\s*([^\n]*?)(?:\n\s*(?:assessment|plan)|$)',
+            r'(?i)(?:observed?|during\s+session)\s*([^\n]*?)(?:\n\s*(?:assessment|plan)|$)',
+        ],
+        SOAPSection.ASSESSMENT: [
+            r'(?i)^a\s*[:|-]?\s*([^\n]*?)(?:^p[:|-]|$)',
+            r'(?i)^assessment\s*[:|-]?\s*([^\n]*?)(?:^plan[:|-]|$)',
+            r'(?i)(?:^|\n)\s*assessment\s*[:|-]?\s*([^\n]*?)(?:\n\s*plan|$)',
+            r'(?i)(?:diagnosis|impression|clinical\s+opinion)\s*[:|-]?\s*([^\n]*?)(?:\n\s*plan|$)',
+        ],
+        SOAPSection.PLAN: [
+            r'(?i)^p\s*[:|-]?\s*(.*)',
+            r'(?i)^plan\s*[:|-]?\s*(.*)',
+            r'(?i)(?:^|\n)\s*plan\s*[:|-]?\s*(.*)',
+            r'(?i)(?:intervention|treatment|homework|next\s+steps?)\s*[:|-]?\s*(.*)',
+        ]
+    }.items()
+}
+
+# Explicit SOAP headers used by detect_soap_format
+_HEADER_PATTERNS = [
+    _compile(pattern) for pattern in [
+        r'(?i)\bs\s*[:|-]', r'(?i)\bsubjective\s*[:|-]',
+        r'(?i)\bo\s*[:|-]', r'(?i)\bobjective\s*[:|-]',
+        r'(?i)\ba\s*[:|-]', r'(?i)\bassessment\s*[:|-]',
+        r'(?i)\bp\s*[:|-]', r'(?i)\bplan\s*[:|-]'
+    ]
+]
+
+# Query keywords that boost specific SOAP sections during retrieval
+_QUERY_SECTION_PATTERNS = {
+    section: _compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    for section, keywords in [
+        (SOAPSection.SUBJECTIVE, ['client said', 'reported', 'expressed', 'feels', 'feeling']),
+        (SOAPSection.OBJECTIVE, ['observed', 'behavior', 'appeared', 'during session']),
+        (SOAPSection.ASSESSMENT, ['diagnosis', 'assessment', 'clinical', 'symptoms', 'criteria']),
+        (SOAPSection.PLAN, ['homework', 'plan', 'intervention', 'goals', 'next steps'])
+    ]
+}
+
+# Sentence boundary splitter for long sections
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Whitespace-delimited words, same boundaries as str.split()
+_WORD_RE = re.compile(r'\S+')
+
 class SOAPParser:
     """Parser for SOAP notes with flexible detection"""
     
+    # SOAP sections in chunking order, with the SOAPContent field holding each
+    _SECTION_FIELD_MAP: ClassVar[Tuple[Tuple[SOAPSection, str], ...]] = (
+        (SOAPSection.SUBJECTIVE, 'subjective'),
+        (SOAPSection.OBJECTIVE, 'objective'),
+        (SOAPSection.ASSESSMENT, 'assessment'),
+        (SOAPSection.PLAN, 'plan')
+    )
+    
+    # Parsed notes kept for re-ingestion of unchanged content
+    PARSE_CACHE_SIZE: ClassVar[int] = 512
+    
     def __init__(self):
-        # Common SOAP section patterns - flexible to handle variations
-        self.soap_patterns = {
-            SOAPSection.SUBJECTIVE: [
-                r'(?i)^s\s*[:|-]?\s*(.*?)(?=^[oa][:|-]|$)',
-                r'(?i)^subjective\s*[:|-]?\s*(.*?)(?=^(?:objective|assessment)[:|-]|$)',
-                r'(?i)(?:^|\n)\s*subjective\s*[:|-]?\s*(.*?)(?=(?:\n\s*(?:objective|assessment)|$))',
-                r'(?i)client\s+(?:reports?|states?|says?)\s+(.*?)(?=\n\s*(?:observed?|assessment|plan)|$)',
-            ],
-            SOAPSection.OBJECTIVE: [
-                r'(?i)^o\s*[:|-]?\s*(.*?)(?=^[ap][:|-]|$)',
-                r'(?i)^objective\s*[:|-]?\s*(.*?)(?=^(?:assessment|plan)[:|-]|$)',
-                r'(?i)(?:^|\n)\s*objective\s*[:|-]?\s*(.*?)(?=(?:\n\s*(?:assessment|plan)|$))',
-                r'(?i)(?:observed?|during\s+session)\s*(.*?)(?=\n\s*(?:assessment|plan)|$)',
-            ],
-            SOAPSection.ASSESSMENT: [
-                r'(?i)^a\s*[:|-]?\s*(.*?)(?=^p[:|-]|$)',
-                r'(?i)^assessment\s*[:|-]?\s*(.*?)(?=^plan[:|-]|$)',
-                r'(?i)(?:^|\n)\s*assessment\s*[:|-]?\s*(.*?)(?=(?:\n\s*plan|$))',
-                r'(?i)(?:diagnosis|impression|clinical\s+opinion)\s*[:|-]?\s*(.*?)(?=\n\s*plan|$)',
-            ],
-            SOAPSection.PLAN: [
-                r'(?i)^p\s*[:|-]?\s*(.*)',
-                r'(?i)^plan\s*[:|-]?\s*(.*)',
-                r'(?i)(?:^|\n)\s*plan\s*[:|-]?\s*(.*)',
-                r'(?i)(?:intervention|treatment|homework|next\s+steps?)\s*[:|-]?\s*(.*)',
-            ]
-        }
+        # Compiled once at import and shared by every parser
+        self.soap_patterns = _SECTION_PATTERNS
+        
+        # Query analysis is pure, so verbatim repeats are served from a cache
+        self._enhance_cached = lru_cache(maxsize=2048)(self._enhance_impl)
+        
+        # Parse results keyed by a digest of the note text, most recently used last
+        self._parse_cache: "OrderedDict[bytes, SOAPContent]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
         
         # Keywords that indicate SOAP-like content
         self.soap_indicators = {
@@ -84,33 +207,56 @@ class SOAPParser:
             'assessment_keywords': ['diagnosis', 'assessment', 'impression', 'clinical opinion', 'meets criteria', 'symptoms indicate'],
             'plan_keywords': ['homework', 'intervention', 'treatment plan', 'next session', 'goals', 'recommended', 'follow-up']
         }
+        # One case-insensitive alternation per category instead of a substring scan per keyword
+        self._indicator_regex = {
+            category: _compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+            for category, keywords in self.soap_indicators.items()
+        }
     
     def detect_soap_format(self, text: str) -> bool:
         """Detect if text follows SOAP format (strict or loose)"""
-        text_lower = text.lower()
+        use_re2 = _re2_safe(text)
         
         # Check for explicit SOAP headers
-        explicit_headers = sum([
-            1 for pattern in [r'(?i)\bs\s*[:|-]', r'(?i)\bsubjective\s*[:|-]', 
-                            r'(?i)\bo\s*[:|-]', r'(?i)\bobjective\s*[:|-]',
-                            r'(?i)\ba\s*[:|-]', r'(?i)\bassessment\s*[:|-]',
-                            r'(?i)\bp\s*[:|-]', r'(?i)\bplan\s*[:|-]']
-            if re.search(pattern, text)
-        ])
+        # Stop scanning as soon as two headers are found
+        explicit_headers = 0
+        for pattern in _HEADER_PATTERNS:
+            if pattern.select(use_re2).search(text):
+                explicit_headers += 1
+                if explicit_headers >= 2:
+                    return True
         
-        if explicit_headers >= 2:
-            return True
-        
-        # Check for SOAP-like keywords indicating structured content
+        # Check for SOAP-like keywords indicating structured content;
+        # consider it SOAP-like if it has keywords from at least 2 categories
         keyword_score = 0
-        for category, keywords in self.soap_indicators.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for pattern in self._indicator_regex.values():
+            if pattern.select(use_re2).search(text):
                 keyword_score += 1
+                if keyword_score >= 2:
+                    return True
         
-        # Consider it SOAP-like if it has keywords from at least 2 categories
-        return keyword_score >= 2
+        return False
     
     def parse_soap_note(self, text: str) -> SOAPContent:
+        """Parse text into SOAP sections, reusing the result for previously seen notes"""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+        
+        if cached is None:
+            cached = self._parse_uncached(text)
+            with self._parse_cache_lock:
+                self._parse_cache[key] = cached
+                self._parse_cache.move_to_end(key)
+                if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+        
+        # Hand out a copy so callers can't alter the cached result
+        return replace(cached)
+    
+    def _parse_uncached(self, text: str) -> SOAPContent:
         """Parse text into SOAP sections with flexible matching"""
         soap_content = SOAPContent()
         
@@ -124,12 +270,14 @@ class SOAPParser:
         # Try to extract each SOAP section
         remaining_text = text
         sections_found = {}
+        use_re2 = _re2_safe(text)
         
         for section, patterns in self.soap_patterns.items():
             for pattern in patterns:
-                matches = re.findall(pattern, text, re.MULTILINE | re.DOTALL)
-                if matches:
-                    content = matches[0].strip() if isinstance(matches[0], str) else ' '.join(matches[0]).strip()
+                # Only the first match is ever used, so stop scanning once it is found
+                match = pattern.select(use_re2).search(text)
+                if match:
+                    content = match.group(1).strip()
                     if content and len(content) > 10:  # Avoid very short matches
                         sections_found[section] = content
                         break
@@ -145,9 +293,11 @@ class SOAPParser:
                    soap_content.assessment, soap_content.plan]):
             soap_content.unstructured = text
         
-        logger.info(f"SOAP parsing results: S={len(soap_content.subjective)}, "
-                   f"O={len(soap_content.objective)}, A={len(soap_content.assessment)}, "
-                   f"P={len(soap_content.plan)}, Unstructured={len(soap_content.unstructured)}")
+        # Lazy %-formatting: nothing is built when INFO is disabled
+        logger.info("SOAP parsing results: S=%d, O=%d, A=%d, P=%d, Unstructured=%d",
+                    len(soap_content.subjective), len(soap_content.objective),
+                    len(soap_content.assessment), len(soap_content.plan),
+                    len(soap_content.unstructured))
         
         return soap_content
     
@@ -172,14 +322,8 @@ class SOAPParser:
             return chunks
         
         # Process each SOAP section
-        sections_to_process = [
-            (SOAPSection.SUBJECTIVE, soap_content.subjective),
-            (SOAPSection.OBJECTIVE, soap_content.objective),
-            (SOAPSection.ASSESSMENT, soap_content.assessment),
-            (SOAPSection.PLAN, soap_content.plan)
-        ]
-        
-        for section_type, content in sections_to_process:
+        for section_type, field_name in self._SECTION_FIELD_MAP:
+            content = getattr(soap_content, field_name)
             if content and content.strip():
                 # For longer sections, we might want to split further
                 # For now, keep each section as one chunk for semantic coherence
@@ -190,63 +334,69 @@ class SOAPParser:
     
     def _chunk_section_content(self, content: str, section_type: SOAPSection, base_metadata: Dict) -> List[SOAPChunk]:
         """Create chunks from a single SOAP section"""
+        # Keys shared by every chunk of this section; each chunk copies and extends it
+        template = dict(base_metadata)
+        template['soap_section'] = section_type.value
+        template['is_soap_format'] = True
+        
         # For most SOAP sections, keep as single chunk to maintain context
         # Only split if very long (>800 chars)
         if len(content) <= 800:
+            metadata = template
+            metadata['section_summary'] = self._create_section_summary(content)
+            metadata['section_length'] = len(content)
             chunk = SOAPChunk(
                 content=content,
                 section_type=section_type,
                 section_content_full=content,
-                metadata={
-                    **base_metadata,
-                    'soap_section': section_type.value,
-                    'is_soap_format': True,
-                    'section_summary': self._create_section_summary(content),
-                    'section_length': len(content)
-                }
+                metadata=metadata
             )
             return [chunk]
         
         # Split longer sections while maintaining sentence boundaries
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        sentences = _SENTENCE_SPLIT_RE.split(content)
         sub_chunks = []
-        current_chunk = ""
+        # Accumulate sentences and join once per chunk rather than growing a string
+        current_parts: List[str] = []
+        current_len = 0  # length of the space-joined parts plus a trailing space
         
         for sentence in sentences:
-            if len(current_chunk) + len(sentence) <= 600:
-                current_chunk += sentence + " "
+            if current_len + len(sentence) <= 600:
+                current_parts.append(sentence)
+                current_len += len(sentence) + 1
             else:
-                if current_chunk:
+                if current_parts:
+                    current_chunk = " ".join(current_parts) + " "
+                    metadata = template.copy()
+                    metadata.update(
+                        section_summary=self._create_section_summary(current_chunk),
+                        section_length=len(current_chunk),
+                        is_partial_section=True
+                    )
                     chunk = SOAPChunk(
                         content=current_chunk.strip(),
                         section_type=section_type,
                         section_content_full=content,
-                        metadata={
-                            **base_metadata,
-                            'soap_section': section_type.value,
-                            'is_soap_format': True,
-                            'section_summary': self._create_section_summary(current_chunk),
-                            'section_length': len(current_chunk),
-                            'is_partial_section': True
-                        }
+                        metadata=metadata
                     )
                     sub_chunks.append(chunk)
-                current_chunk = sentence + " "
+                current_parts = [sentence]
+                current_len = len(sentence) + 1
         
         # Add remaining content
+        current_chunk = " ".join(current_parts) + " "
         if current_chunk.strip():
+            metadata = template.copy()
+            metadata.update(
+                section_summary=self._create_section_summary(current_chunk),
+                section_length=len(current_chunk),
+                is_partial_section=True
+            )
             chunk = SOAPChunk(
                 content=current_chunk.strip(),
                 section_type=section_type,
                 section_content_full=content,
-                metadata={
-                    **base_metadata,
-                    'soap_section': section_type.value,
-                    'is_soap_format': True,
-                    'section_summary': self._create_section_summary(current_chunk),
-                    'section_length': len(current_chunk),
-                    'is_partial_section': True
-                }
+                metadata=metadata
             )
             sub_chunks.append(chunk)
         
@@ -254,7 +404,8 @@ class SOAPParser:
     
     def _create_section_summary(self, content: str) -> str:
         """Create a brief summary of section content for metadata"""
-        words = content.split()
+        # Only the first 21 words are needed to decide, so don't split the whole section
+        words = [match.group(0) for match in islice(_WORD_RE.finditer(content), 21)]
         if len(words) <= 20:
             return content
         
@@ -263,42 +414,44 @@ class SOAPParser:
     
     def enhance_retrieval_query(self, query: str) -> Dict[str, Any]:
         """Analyze query to determine which SOAP sections are most relevant"""
-        query_lower = query.lower()
-        
-        # Keywords that suggest specific SOAP sections
-        section_weights = {
-            SOAPSection.SUBJECTIVE: 1.0,
-            SOAPSection.OBJECTIVE: 1.0,
-            SOAPSection.ASSESSMENT: 1.0,
-            SOAPSection.PLAN: 1.0
-        }
-        
-        # Boost sections based on query keywords
-        if any(keyword in query_lower for keyword in ['client said', 'reported', 'expressed', 'feels', 'feeling']):
-            section_weights[SOAPSection.SUBJECTIVE] = 1.5
-        
-        if any(keyword in query_lower for keyword in ['observed', 'behavior', 'appeared', 'during session']):
-            section_weights[SOAPSection.OBJECTIVE] = 1.5
-            
-        if any(keyword in query_lower for keyword in ['diagnosis', 'assessment', 'clinical', 'symptoms', 'criteria']):
-            section_weights[SOAPSection.ASSESSMENT] = 1.5
-            
-        if any(keyword in query_lower for keyword in ['homework', 'plan', 'intervention', 'goals', 'next steps']):
-            section_weights[SOAPSection.PLAN] = 1.5
-        
+        section_weights, keywords = self._enhance_cached(query.lower())
+        # Fresh containers each call so callers can't mutate the cached result
         return {
-            'section_weights': section_weights,
-            'enhanced_keywords': self._extract_clinical_keywords(query)
+            'section_weights': dict(section_weights),
+            'enhanced_keywords': list(keywords)
         }
     
+    def _enhance_impl(self, query_lower: str) -> Tuple[Tuple[Tuple[SOAPSection, float], ...], Tuple[str, ...]]:
+        """Hashable section weights and clinical keywords for a lowercased query"""
+        # Boost sections based on query keywords
+        use_re2 = _re2_safe(query_lower)
+        section_weights = tuple(
+            (section, 1.5 if pattern.select(use_re2).search(query_lower) else 1.0)
+            for section, pattern in _QUERY_SECTION_PATTERNS.items()
+        )
+        return section_weights, tuple(self._extract_clinical_keywords(query_lower))
+    
     def _extract_clinical_keywords(self, query: str) -> List[str]:
         """Extract clinical/therapeutic keywords from query"""
-        clinical_terms = [
-            'anxiety', 'depression', 'trauma', 'ptsd', 'therapy', 'counseling',
-            'coping', 'stress', 'breakthrough', 'progress', 'setback', 'goals',
-            'relationship', 'family', 'work', 'career', 'emotional', 'feelings',
-            'mindfulness', 'homework', 'assignment', 'intervention', 'session'
-        ]
-        
         query_lower = query.lower()
-        return [term for term in clinical_terms if term in query_lower]
\ No newline at end of file
+        if AHOCORASICK_AVAILABLE:
+            # Single pass over the query; indices keep results in CLINICAL_TERMS order
+            found = {index for _, index in _CLINICAL_AUTOMATON.iter(query_lower)}
+            return [CLINICAL_TERMS[index] for index in sorted(found)]
+        return [term for term in CLINICAL_TERMS if term in query_lower]
+
+_DEFAULT_PARSER: Optional[SOAPParser] = None
+_DEFAULT_PARSER_LOCK = threading.Lock()
+
+def get_default_parser() -> SOAPParser:
+    """Return a shared SOAPParser so its compiled patterns are built once per process.
+
+    Parser state is read-only after construction apart from its caches, which are
+    thread-safe, so the instance is safe to share across threads.
+    """
+    global _DEFAULT_PARSER
+    if _DEFAULT_PARSER is None:
+        with _DEFAULT_PARSER_LOCK:
+            if _DEFAULT_PARSER is None:
+                _DEFAULT_PARSER = SOAPParser()
+    return _DEFAULT_PARSER
@@ -1,7 +1,11 @@
+import sys
+import logging
 from backend.rag_engine import RAGEngine
 
 def test_ingestion(client_id: str):
     print(f"\n🔍 Testing ingestion for client: {client_id}")
+    # The chunk debug dump is only written when the engine logs at DEBUG
+    logging.getLogger(RAGEngine.__module__).setLevel(logging.DEBUG)
     engine = RAGEngine()
     success = engine.ingest_client_documents(client_id, force_reprocess=True)
 
@@ -16,11 +20,15 @@ def test_ingestion(client_id: str):
             print(f"\n📄 Debug file found: {debug_path.name}")
             with open(debug_path, "r", encoding="utf-8") as f:
                 chunk_data = json.load(f)
+                # Build the whole report and write it once instead of printing per line
+                lines = []
                 for i, chunk in enumerate(chunk_data, start=1):
-                    print(f"\n--- Chunk {i} ---")
-                    print(f"Chunk ID: {chunk['chunk_id']}")
-                    print(f"Content Preview: {chunk['content']}")
-                    print(f"Metadata: {json.dumps(chunk['metadata'], indent=2)}")
+                    lines.append(f"\n--- Chunk {i} ---")
+                    lines.append(f"Chunk ID: {chunk['chunk_id']}")
+                    lines.append(f"Content Preview: {chunk['content']}")
+                    lines.append(f"Metadata: {json.dumps(chunk['metadata'], indent=2)}")
+                if lines:
+                    sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("\n⚠️ No debug file found — something may have gone wrong.")
     else:
@@ -0,0 +1,42 @@
+import random
+from dataclasses import asdict
+
+from backend import soap_parser
+from backend.soap_parser import SOAPParser
+
+# Non-ASCII and non-printing whitespace routinely left behind by PDF/DOCX extraction
+SAMPLE_NOTES = [
+    "Today the client\xa0reports feeling overwhelmed at work.\nDuring\xa0session she was tearful and withdrawn.",
+    "S:\xa0Client reports poor sleep and racing thoughts this week.\vO: Appeared fatigued, slow speech.\nA: Symptoms indicate depression.\nP: Continue CBT, sleep hygiene homework.",
+    "Subjective: José states the café job is stressful lately.\nObjective: observed calm affect throughout.\nAssessment: adjustment difficulties, progress steady.\nPlan: next session in two weeks.",
+    "s\x1c: short\no\x1f: also short\nassessment - clinical opinion is mild anxiety today\nplan: homework journaling daily",
+]
+
+def _random_notes(count: int):
+    tokens = ["client", "reports", "states", "observed", "during", "session", "diagnosis",
+              "plan", "homework", "S:", "O:", "A:", "P:", "assessment", "feeling", "é", "ñ",
+              " ", "\n", "\xa0", "\v", "\x1c", "\u2003", ".", "-", ":"]
+    rng = random.Random(0)
+    return [" ".join(rng.choice(tokens) for _ in range(rng.randint(5, 80))) for _ in range(count)]
+
+def test_re2_parity():
+    """Parsing must not depend on whether the optional re2 engine is installed"""
+    if not soap_parser.RE2_AVAILABLE:
+        print("re2 not installed - nothing to compare")
+        return
+
+    notes = SAMPLE_NOTES + _random_notes(2000)
+    with_re2 = [asdict(SOAPParser()._parse_uncached(note)) for note in notes]
+    soap_parser.RE2_AVAILABLE = False
+    try:
+        without_re2 = [asdict(SOAPParser()._parse_uncached(note)) for note in notes]
+    finally:
+        soap_parser.RE2_AVAILABLE = True
+
+    mismatches = [note for note, a, b in zip(notes, with_re2, without_re2) if a != b]
+    assert not mismatches, f"{len(mismatches)} notes parsed differently with re2, e.g. {mismatches[0]!r}"
+    print(f"✅ {len(notes)} notes parse identically with and without re2")
+
+
+if __name__ == "__main__":
+    test_re2_parity()
@@ -0,0 +1,95 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from backend.rag_engine import InMemoryVectorDB
+
+def _filled_db(quantize: bool, rows: int = 20, dim: int = 8) -> InMemoryVectorDB:
+    db = InMemoryVectorDB(quantize=quantize)
+    rng = np.random.default_rng(0)
+    for i in range(rows):
+        db.add("client", f"chunk{i}", rng.standard_normal(dim).tolist(), f"content {i}",
+               {"meeting_id": f"m{i % 3}", "date_ordinal": 738000 + i})
+    return db
+
+def _ranking(db: InMemoryVectorDB, query: np.ndarray, **kwargs):
+    return [(chunk["id"], round(chunk["distance"], 5)) for chunk in db.query("client", query, top_k=5, **kwargs)]
+
+def test_round_trip():
+    """A saved client loads back with the same rows and rankings, for float32 and int8 matrices"""
+    query = np.random.default_rng(1).standard_normal(8)
+    for quantize in (False, True):
+        db = _filled_db(quantize)
+        with tempfile.TemporaryDirectory() as tmp:
+            db.save("client", Path(tmp))
+            assert (Path(tmp) / "client.scales.npy").exists() == quantize
+
+            loaded = InMemoryVectorDB()
+            loaded.load(Path(tmp))
+            assert loaded.get_client_chunk_count("client") == 20
+            assert loaded.matrices["client"].dtype == (np.int8 if quantize else np.float32)
+            assert _ranking(loaded, query) == _ranking(db, query)
+            assert _ranking(loaded, query, meeting_ids=["m1"]) == _ranking(db, query, meeting_ids=["m1"])
+            assert _ranking(loaded, query, min_date_ordinal=738010) == _ranking(db, query, min_date_ordinal=738010)
+            del loaded  # release the memory map before the directory is removed
+        print(f"✅ {'int8' if quantize else 'float32'} vectors round-trip through save/load")
+
+def test_overwrite_after_mmap_load():
+    """Replacing a row of a memory-mapped matrix must not write through to the file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _filled_db(quantize=False).save("client", Path(tmp))
+        matrix_path = Path(tmp) / "client.npy"
+        on_disk = matrix_path.read_bytes()
+
+        db = InMemoryVectorDB()
+        db.load(Path(tmp))
+        replacement = np.ones(8)
+        db.add("client", "chunk3", replacement.tolist(), "replaced", {"meeting_id": "m0"})
+
+        assert db.get_client_chunk_count("client") == 20
+        top = db.query("client", replacement, top_k=1)[0]
+        assert top["id"] == "chunk3" and top["content"] == "replaced"
+        assert matrix_path.read_bytes() == on_disk
+        del db
+    print("✅ Overwriting a memory-mapped row leaves the saved matrix untouched")
+
+def test_mismatched_sidecar_is_skipped():
+    """A matrix whose sidecar disagrees on the row count is logged and not served"""
+    class _Records(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _filled_db(quantize=False).save("client", Path(tmp))
+        sidecar_path = Path(tmp) / "client.json"
+        sidecar = json.loads(sidecar_path.read_text(encoding="utf-8"))
+        for key in ("ids", "contents", "metadatas"):
+            sidecar[key] = sidecar[key][:-1]
+        sidecar_path.write_text(json.dumps(sidecar), encoding="utf-8")
+
+        handler = _Records()
+        logger = logging.getLogger(InMemoryVectorDB.__module__)
+        logger.addHandler(handler)
+        try:
+            db = InMemoryVectorDB()
+            db.load(Path(tmp))
+        finally:
+            logger.removeHandler(handler)
+
+        assert db.get_client_chunk_count("client") == 0
+        assert db.query("client", np.ones(8)) == []
+        assert any("Skipping in-memory vectors for client client" in message for message in handler.messages)
+    print("✅ Mismatched matrix and sidecar are skipped and logged")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_overwrite_after_mmap_load()
+    test_mismatched_sidecar_is_skipped()